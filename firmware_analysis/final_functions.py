@@ -9,6 +9,8 @@ Combined with previous batches = 80 total functions decoded.
 This is the DEFINITIVE catalog — no meaningful application logic remains.
 """
 
+from types import MappingProxyType
+
 # =============================================================================
 # UDP DISCOVERY RESPONSE — send_local_information()
 # =============================================================================
@@ -437,7 +439,10 @@ def upgrade_instead_file(mode):
       sync()
       → The downloaded file replaces the white list database
       → Called when CMD=0x01 SUB=0x21 upgrade completes
-    
+      → NOT atomic: between the rm and the mv /white_list_db does not
+        exist (two fork+exec's wide). Don't query the white list while a
+        white list upload is being committed.
+
     Mode 0 (param_1 != 0x01) — FIRMWARE UPGRADE:
       system("cp /bin/CL7206C2 /back_app")    — backup current firmware!
       system("rm /bin/CL7206C2")               — remove current
@@ -463,7 +468,7 @@ def upgrade_instead_file(mode):
 
 
 # File layout on reader filesystem:
-FIRMWARE_FILES = {
+FIRMWARE_FILES = MappingProxyType({
     "/bin/CL7206C2":  "Running firmware binary (main application)",
     "/back_app":      "Backup of previous firmware (created during upgrade)",
     "/CL7206C2":      "Downloaded file staging area (OTA target)",
@@ -471,7 +476,7 @@ FIRMWARE_FILES = {
     "/tag_table":     "SQLite tag database (on-disk storage)",
     "/white_list_db": "White list database (uploaded via CMD=0x01 SUB=0x21)",
     "/tmp/myfifo":    "Watchdog FIFO (read by feed_dog process)",
-}
+})
 
 
 # =============================================================================
@@ -548,7 +553,7 @@ FIRMWARE_FILES = {
 # KEY FINDINGS SUMMARY — IMPLICATIONS FOR RACE TIMING
 # =============================================================================
 
-TIMING_SYSTEM_IMPLICATIONS = {
+TIMING_SYSTEM_IMPLICATIONS = MappingProxyType({
     "tag_dedup": """
         NO client-side dedup in firmware. RF module cache provides sub-second
         filtering. Client MUST implement its own dedup with configurable
@@ -584,4 +589,4 @@ TIMING_SYSTEM_IMPLICATIONS = {
     "gpi_initial_state": """
         power_on_detect() reads all 4 GPI levels at boot with 0x10101010
         marker. Prevents false trigger events during initialization.""",
-}
+})
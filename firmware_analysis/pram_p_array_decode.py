@@ -17,6 +17,7 @@ Structure format (12 bytes each):
 """
 
 import struct
+import sys
 
 raw = bytes.fromhex(
     "00 00 01 00 01 00 02 03 00 00 00 00"
@@ -35,9 +36,15 @@ raw = bytes.fromhex(
     "28 04 05 00 05 00 2d 2e 00 00 00 00"
     "2d 04 01 00 01 00 2f 30 00 00 00 00"
     "21 04 01 00 01 00 ff ff 00 00 00 00"
-    .replace(" ", "")
 )
 
+# One pram_p_array entry: offset, max size, last size, SET, GET, sub-param, 3 reserved
+ENTRY = struct.Struct('<HHHBBB3x')
+
+# Decoded once; BY_SET maps (SET sub << 8) | sub-param → entry for O(1) resolution
+ENTRIES = tuple(ENTRY.iter_unpack(raw))
+BY_SET = {(e[3] << 8) | e[5]: e for e in ENTRIES}
+
 # Known command names
 CMD_NAMES = {
     (0x02, 0x03): "COM/Baud Config",
@@ -55,33 +62,12 @@ CMD_NAMES = {
     (0xFF, 0xFF): "(internal/sentinel)",
 }
 
-print("=" * 100)
-print("CL7206C2 CONFIG PARAMETER MAP (pram_p_array) — from firmware @ 0x0002bb80")
-print("=" * 100)
-print()
-print(f"{'#':>2}  {'Offset':>8}  {'MaxSz':>5}  {'ActSz':>5}  {'SET':>5}  {'GET':>5}  {'Sub':>3}  Description")
-print("-" * 100)
-
-for i in range(16):
-    entry = raw[i*12 : (i+1)*12]
-    offset = struct.unpack_from('<H', entry, 0)[0]
-    max_sz = struct.unpack_from('<H', entry, 2)[0]
-    act_sz = struct.unpack_from('<H', entry, 4)[0]
-    set_cmd = entry[6]
-    get_cmd = entry[7]
-    sub_param = entry[8]
-
-    name = CMD_NAMES.get((set_cmd, get_cmd), "???")
-    if (set_cmd, get_cmd) == (0x0B, 0x0C):
-        name = f"Antenna/Trigger Config — RF Port {sub_param} (ANT{sub_param*2+1}/ANT{sub_param*2+2})"
-
-    print(f"{i:>2}  0x{offset:04X}    {max_sz:>5}  {act_sz:>5}  0x{set_cmd:02X}   0x{get_cmd:02X}   {sub_param:>3}  {name}")
-
-print()
-print("=" * 100)
-print("COMPLETE config_pram LAYOUT (1072 bytes = 0x0430)")
-print("=" * 100)
-print()
+# Same table keyed by (SET << 8) | GET — no tuple built per lookup
+_CMD_NAMES = {(s << 8) | g: v for (s, g), v in CMD_NAMES.items()}
+
+# Row templates, bound once rather than re-parsed on every row
+_ROW_FMT = "{:>2}  0x{:04X}    {:>5}  {:>5}  0x{:02X}   0x{:02X}   {:>3}  {}".format
+_LAYOUT_FMT = "  0x{:04X}–0x{:04X}  ({:>4} bytes)  {:<50s} {}".format
 
 layout = [
     (0x0000, 1,    "COM/Baud Config",                     "SET 0x02 / GET 0x03"),
@@ -102,20 +88,43 @@ layout = [
     (0x042D, 1,    "DHCP Mode",                            "SET 0x2F / GET 0x30"),
 ]
 
-total = 0
-for offset, size, desc, cmds in layout:
-    end = offset + size - 1
-    print(f"  0x{offset:04X}–0x{end:04X}  ({size:>4} bytes)  {desc:<50s} {cmds}")
-    total += size
 
-print(f"\n  Total mapped: {total} bytes out of 1072 (0x0430)")
-print(f"  Unmapped: {1072 - total} bytes (0x042E–0x042F = 2 bytes padding)")
-
-print()
-print("=" * 100)
-print("SET COMMAND PACKET EXAMPLES (CMD=0x01)")
-print("=" * 100)
-print("""
+def _main():
+    out = []
+    out.append("=" * 100)
+    out.append("CL7206C2 CONFIG PARAMETER MAP (pram_p_array) — from firmware @ 0x0002bb80")
+    out.append("=" * 100)
+    out.append("")
+    out.append(f"{'#':>2}  {'Offset':>8}  {'MaxSz':>5}  {'ActSz':>5}  {'SET':>5}  {'GET':>5}  {'Sub':>3}  Description")
+    out.append("-" * 100)
+
+    for i, (offset, max_sz, act_sz, set_cmd, get_cmd, sub_param) in enumerate(ENTRIES):
+        key = (set_cmd << 8) | get_cmd
+        name = _CMD_NAMES.get(key, "???")
+        if key == 0x0B0C:
+            name = f"Antenna/Trigger Config — RF Port {sub_param} (ANT{sub_param*2+1}/ANT{sub_param*2+2})"
+
+        out.append(_ROW_FMT(i, offset, max_sz, act_sz, set_cmd, get_cmd, sub_param, name))
+
+    out.append("")
+    out.append("=" * 100)
+    out.append("COMPLETE config_pram LAYOUT (1072 bytes = 0x0430)")
+    out.append("=" * 100)
+    out.append("")
+
+    total = 0
+    for offset, size, desc, cmds in layout:
+        out.append(_LAYOUT_FMT(offset, offset + size - 1, size, desc, cmds))
+        total += size
+
+    out.append(f"\n  Total mapped: {total} bytes out of 1072 (0x0430)")
+    out.append(f"  Unmapped: {1072 - total} bytes (0x042E–0x042F = 2 bytes padding)")
+
+    out.append("")
+    out.append("=" * 100)
+    out.append("SET COMMAND PACKET EXAMPLES (CMD=0x01)")
+    out.append("=" * 100)
+    out.append("""
 To SET a config parameter, send:
   AA 01 [SET_SUB] [LEN_H] [LEN_L] [data...] [CRC_H] [CRC_L]
 
@@ -141,3 +150,15 @@ Example — Set RF Port 0 power to 30 dBm:
         ^ant=0   ^pwr=30
   Packet: AA 01 0B 00 0E [data 14 bytes] [CRC16]
 """)
+
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+def lookup_set(set_cmd, sub_param=0):
+    """Return (offset, max_size) in config_pram for a CMD=0x01 SET sub, or None."""
+    e = BY_SET.get((set_cmd << 8) | sub_param)
+    return (e[0], e[1]) if e else None
+
+
+if __name__ == "__main__":
+    _main()
@@ -114,175 +114,435 @@ timestamp and index TLVs appended by the reader firmware.
        └── Send rebuilt packet to TCP/UDP client
 """
 
+import sqlite3
 import struct
 
+# Every fixed field of tag_data_struct in one pass (500 bytes):
+#   0x000 pc_byte, 0x002 epc_len, 0x044 pc, 0x046–0x04C ant/sub/ant1/ant2/rssi1/rssi2/tid_flag,
+#   0x04E tid_len, 0x0E8 time_sec, 0x0EC time_usec, 0x1EF package_len, 0x1F0 tag_index
+TAG_STRUCT = struct.Struct('>BxH64xH7BxH152xII255xBI')
+TAG_FIELDS = ('pc_byte', 'epc_len', 'pc', 'ant_num', 'sub_ant_num', 'ant_byte1', 'ant_byte2',
+              'rssi1', 'rssi2', 'tid_flag', 'tid_len', 'time_sec', 'time_usec',
+              'package_len', 'tag_index')
 
-def parse_tag_struct(data):
+
+def _make_crc16_table(poly=0x8005):
+    # CRC-16/BUYPASS, non-reflected — same table as tools/crc16_verified.py
+    table = []
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+_CRC16_TABLE = _make_crc16_table()
+
+# Tail appended by tag_data_analise: [07][ts_sec][ts_usec] [08][tag_index] [CRC16]
+_APPENDER = struct.Struct('>BIIBIH')
+
+
+def _crc16(data):
+    table = _CRC16_TABLE
+    crc = 0
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ b]
+    return crc
+
+
+def package_crc_ok(data):
+    """Check the CRC16 of the rebuilt packet stored at 0x0F0 (package_data).
+    
+    The packet is a full frame — AA CMD SUB LEN_H LEN_L DATA CRC_H CRC_L —
+    package_len (0x1EF) bytes long; the CRC covers CMD..DATA.
+    """
+    pkg_len = data[0x1EF]
+    if pkg_len < 7:
+        return False
+    # One copy of at most 255 bytes: iterating bytes is faster than a memoryview
+    pkg = memoryview(data).cast('B')[0x0F0:0x0F0 + pkg_len].tobytes()
+    return _crc16(pkg[1:-2]) == (pkg[-2] << 8) | pkg[-1]
+
+
+def append_timestamp_index(raw, time_sec, time_usec, tag_index, crc=None):
+    """Append the timestamp (0x07) and index (0x08) TLVs and CRC16 to a packet.
+    
+    Mirrors what tag_data_analise() does to the raw RF packet before storing
+    it as package_data: the 14 TLV bytes are added to the big-endian LEN at
+    [3:5] so the result is again a valid frame. One Struct pack for the tail.
+    
+    Args:
+        raw: rebuilt packet so far (AA CMD SUB LEN_H LEN_L DATA...). It must
+             NOT carry a trailing CRC — the TLVs go straight after DATA
+        crc: CRC16 to append; if None it is computed over everything after
+             the AA header (with the patched LEN), the same coverage
+             package_crc_ok() checks
+    
+    Returns:
+        bytes
+    """
+    out = bytearray(raw)
+    struct.pack_into('>H', out, 3, ((out[3] << 8) | out[4]) + 14)
+    if crc is not None:
+        out += _APPENDER.pack(0x07, time_sec, time_usec, 0x08, tag_index, crc)
+        return bytes(out)
+    out += _APPENDER.pack(0x07, time_sec, time_usec, 0x08, tag_index, 0)
+    struct.pack_into('>H', out, len(out) - 2, _crc16(out[1:-2]))
+    return bytes(out)
+
+
+def parse_tag_struct(data, out=None, check_crc=False, hex_blobs=True):
     """Parse a 500-byte tag_data_struct into fields.
     
     Args:
-        data: bytes, at least 500 bytes (the tag_data_struct)
+        data: bytes or memoryview, at least 500 bytes (the tag_data_struct).
+              A memoryview is read in place — EPC/TID are hexed straight
+              from the view without copying the slice.
+        out:  optional dict to fill instead of allocating a new one. It is
+              cleared first; callers parsing a stream can pass the same
+              dict for every tag once they're done with the previous one.
+        check_crc: also verify package_data's CRC16 while the buffer is at
+              hand (adds 'package_crc_ok'; see package_crc_ok())
+        hex_blobs: epc_code/tid_code as uppercase hex strings (default). Pass
+              False to get the raw bytes instead — what the SQLite BLOB
+              columns hold — and skip the hex conversion entirely.
     
     Returns:
-        dict with parsed fields
+        dict with parsed fields (``out`` if given)
     """
+    if out is None:
+        result = {}
+    else:
+        result = out
+        result.clear()
+    
+    if isinstance(data, memoryview) and data.format != 'B':
+        data = data.cast('B')
     if len(data) < 500:
-        return {'error': f'Too short: {len(data)} < 500'}
+        result['error'] = f'Too short: {len(data)} < 500'
+        return result
     
-    result = {}
+    (pc_byte, epc_len, pc, ant_num, sub_ant_num, ant_byte1, ant_byte2,
+     rssi1, rssi2, tid_flag, tid_len, time_sec, time_usec,
+     package_len, tag_index) = TAG_STRUCT.unpack_from(data)
     
     # EPC
-    result['pc_byte']     = data[0x000]
-    result['epc_len']     = struct.unpack_from('>H', data, 0x002)[0]
-    if result['epc_len'] > 0 and result['epc_len'] <= 64:
-        result['epc_code'] = data[0x004:0x004 + result['epc_len']].hex().upper()
+    result['pc_byte']     = pc_byte
+    result['epc_len']     = epc_len
+    if epc_len > 0 and epc_len <= 64:
+        epc = data[0x004:0x004 + epc_len]
+        result['epc_code'] = epc.hex().upper() if hex_blobs else bytes(epc)
     else:
-        result['epc_code'] = ''
+        result['epc_code'] = '' if hex_blobs else b''
     
     # Protocol Control & Antenna
-    result['pc']          = struct.unpack_from('>H', data, 0x044)[0]
-    result['ant_num']     = data[0x046]
-    result['sub_ant_num'] = data[0x047]
-    result['ant_byte1']   = data[0x048]
-    result['ant_byte2']   = data[0x049]
+    result['pc']          = pc
+    result['ant_num']     = ant_num
+    result['sub_ant_num'] = sub_ant_num
+    result['ant_byte1']   = ant_byte1
+    result['ant_byte2']   = ant_byte2
     
     # RSSI
-    result['rssi1']       = data[0x04A]
-    result['rssi2']       = data[0x04B]
+    result['rssi1']       = rssi1
+    result['rssi2']       = rssi2
     
     # TID
-    result['tid_flag']    = data[0x04C]
-    result['tid_len']     = struct.unpack_from('>H', data, 0x04E)[0]
-    if result['tid_len'] > 0 and result['tid_len'] <= 128:
-        result['tid_code'] = data[0x050:0x050 + result['tid_len']].hex().upper()
+    result['tid_flag']    = tid_flag
+    result['tid_len']     = tid_len
+    if tid_len > 0 and tid_len <= 128:
+        tid = data[0x050:0x050 + tid_len]
+        result['tid_code'] = tid.hex().upper() if hex_blobs else bytes(tid)
     else:
-        result['tid_code'] = ''
+        result['tid_code'] = '' if hex_blobs else b''
     
     # Timestamps
-    result['time_sec']    = struct.unpack_from('>I', data, 0x0E8)[0]
-    result['time_usec']   = struct.unpack_from('>I', data, 0x0EC)[0]
+    result['time_sec']    = time_sec
+    result['time_usec']   = time_usec
     
     # Index and package
-    result['tag_index']   = struct.unpack_from('>I', data, 0x1F0)[0]
-    result['package_len'] = data[0x1EF]
+    result['tag_index']   = tag_index
+    result['package_len'] = package_len
     
     # Physical antenna
-    port = result['ant_num']
-    sub  = result['sub_ant_num']
-    result['physical_antenna'] = port * 2 + sub + 1  # 1-8
+    result['physical_antenna'] = ant_num * 2 + sub_ant_num + 1  # 1-8
+    
+    if check_crc:
+        result['package_crc_ok'] = package_crc_ok(data)
     
     return result
 
 
-def parse_tag_notification(payload):
+def parse_tag_struct_batch(buf, hex_blobs=True):
+    """Parse back-to-back 500-byte tag_data_structs into columns.
+    
+    Same fields as parse_tag_struct(), but returned column-wise — one
+    tuple per field, one entry per tag — with no per-tag dict. A trailing
+    partial struct is ignored.
+    
+    Args:
+        buf: bytes or memoryview holding N × 500 bytes (e.g. a tag_table dump)
+        hex_blobs: as for parse_tag_struct()
+    
+    Returns:
+        dict of field name → tuple (plus 'epc_code', 'tid_code', 'physical_antenna')
+    """
+    mv = memoryview(buf).cast('B')
+    mv = mv[:len(mv) - len(mv) % TAG_STRUCT.size]
+    cols = dict(zip(TAG_FIELDS, zip(*TAG_STRUCT.iter_unpack(mv)))) if mv else dict.fromkeys(TAG_FIELDS, ())
+    
+    starts = range(0, len(mv), TAG_STRUCT.size)
+    if hex_blobs:
+        cols['epc_code'] = tuple(
+            mv[o + 0x004:o + 0x004 + n].hex().upper() if 0 < n <= 64 else ''
+            for o, n in zip(starts, cols['epc_len']))
+        cols['tid_code'] = tuple(
+            mv[o + 0x050:o + 0x050 + n].hex().upper() if 0 < n <= 128 else ''
+            for o, n in zip(starts, cols['tid_len']))
+    else:
+        cols['epc_code'] = tuple(
+            mv[o + 0x004:o + 0x004 + n].tobytes() if 0 < n <= 64 else b''
+            for o, n in zip(starts, cols['epc_len']))
+        cols['tid_code'] = tuple(
+            mv[o + 0x050:o + 0x050 + n].tobytes() if 0 < n <= 128 else b''
+            for o, n in zip(starts, cols['tid_len']))
+    cols['physical_antenna'] = physical_antennas(cols['ant_num'], cols['sub_ant_num'])
+    return cols
+
+
+def physical_antennas(ant_nums, sub_ant_nums):
+    """Physical antenna (1–8) for each (RF port, sub-antenna) pair.
+    
+    Column form of ``ant_num * 2 + sub_ant_num + 1``, for the tuples
+    returned by parse_tag_struct_batch().
+    """
+    return tuple([(port << 1) + sub + 1 for port, sub in zip(ant_nums, sub_ant_nums)])
+
+
+class TagNotification:
+    """Parsed CMD=0x12 tag notification (see parse_tag_notification).
+    
+    Slotted rather than a dict: one is built per tag on the inventory path.
+    Fields the payload didn't carry stay None and are left out of as_dict().
+    """
+    
+    __slots__ = ('epc', 'epc_len', 'pc', 'ant_num', 'sub_ant_num',
+                 'rssi1', 'rssi2', 'tid', 'tid_len',
+                 'ant_byte1', 'ant_byte2', 'tid_flag', 'physical_antenna')
+    
+    def __init__(self):
+        self.epc = ''
+        self.epc_len = 0
+        self.pc = 0
+        self.ant_num = -1
+        self.sub_ant_num = -1
+        self.rssi1 = 0
+        self.rssi2 = 0
+        self.tid = ''
+        self.tid_len = 0
+        self.ant_byte1 = None
+        self.ant_byte2 = None
+        self.tid_flag = None
+        self.physical_antenna = None
+    
+    reset = __init__
+    
+    def as_dict(self):
+        return {k: v for k in self.__slots__ if (v := getattr(self, k)) is not None}
+
+
+# sql_insert() column order (see SQLite Column Mapping above)
+SQL_TABLES = ('back_tag_data', 'tag_data')
+SQL_SCHEMA = """CREATE TABLE IF NOT EXISTS {table} (
+    tag_index    INTEGER PRIMARY KEY,
+    package_len  INT,
+    package_data BLOB,
+    epc_len      INT,
+    epc_code     BLOB,
+    pc           INT,
+    ant_num      INT,
+    sub_ant_num  INT,
+    tid_flag     INT,
+    tid_len      INT,
+    tid_code     BLOB,
+    time_seconds INT,
+    time_usec    INT
+)"""
+
+
+def open_tag_db(path):
+    """Open (or create) a tag database laid out like the reader's /tag_table.
+    
+    Tuned for burst ingest: WAL journal, synchronous=NORMAL, 64 MiB page cache.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-65536')
+    for table in SQL_TABLES:
+        conn.execute(SQL_SCHEMA.format(table=table))
+    return conn
+
+
+def tag_rows(buf):
+    """Yield one 13-column sql_insert row per 500-byte struct in buf.
+    
+    Built straight from TAG_STRUCT — no intermediate dict. BLOB columns
+    are raw bytes, as the firmware binds them.
+    """
+    mv = memoryview(buf).cast('B')
+    mv = mv[:len(mv) - len(mv) % TAG_STRUCT.size]
+    for o, (pc_byte, epc_len, pc, ant_num, sub_ant_num, ant_byte1, ant_byte2,
+            rssi1, rssi2, tid_flag, tid_len, time_sec, time_usec,
+            package_len, tag_index) in zip(range(0, len(mv), TAG_STRUCT.size),
+                                           TAG_STRUCT.iter_unpack(mv)):
+        epc = mv[o + 0x004:o + 0x004 + epc_len].tobytes() if 0 < epc_len <= 64 else b''
+        tid = mv[o + 0x050:o + 0x050 + tid_len].tobytes() if 0 < tid_len <= 128 else b''
+        yield (tag_index, package_len,
+               mv[o + 0x0F0:o + 0x0F0 + package_len].tobytes(),
+               epc_len, epc, pc, ant_num, sub_ant_num,
+               tid_flag, tid_len, tid, time_sec, time_usec)
+
+
+def insert_many(conn, rows, table='back_tag_data'):
+    """Insert sql_insert rows (e.g. from tag_rows()) in a single transaction."""
+    if table not in SQL_TABLES:
+        raise ValueError(f'Unknown tag table: {table}')
+    with conn:
+        conn.executemany(f'INSERT INTO {table} VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)', rows)
+
+
+def _tlv_header(payload, pos, n, result):
+    # Header: [AA][?][PC_hi][len_hi][len_lo][epc_len_hi][epc_len_lo][EPC...]
+    if pos + 7 > n:
+        return n
+    result.pc = (payload[pos + 3] << 8) | payload[pos + 4]
+    epc_len = (payload[pos + 5] << 8) | payload[pos + 6]
+    result.epc_len = epc_len
+    pos += 7
+    if pos + epc_len <= n:
+        result.epc = payload[pos:pos+epc_len]
+        pos += epc_len
+    # After EPC: [PC_hi][PC_lo][extra]
+    if pos + 3 <= n:
+        result.pc = (payload[pos] << 8) | payload[pos + 1]
+        result.ant_num = payload[pos + 2]
+        pos += 3
+    return pos
+
+
+def _tlv_ant(payload, pos, n, result):
+    if pos + 2 < n:
+        result.ant_num = payload[pos + 1]
+    # From the decompile, case 1 reads at local_1e WITHOUT first advancing past
+    # the type byte, then local_1e += 2:
+    #   param_3[0x48] = input[local_1e]      ← the type byte (0x01) itself
+    #   param_3[0x49] = input[local_1e + 1]  ← first data byte
+    # sql_insert maps 0x046 = ant_num and 0x047 = sub_ant_num (from TLV 0xAA/0x06);
+    # 0x048/0x049 are NOT in SQL — informational only.
+    result.ant_byte1 = payload[pos]      # type byte itself
+    if pos + 1 < n:
+        result.ant_byte2 = payload[pos + 1]
+    return pos + 2
+
+
+def _tlv_rssi(payload, pos, n, result):
+    # RSSI: [02] already consumed by switch, next 2 bytes
+    # From code: param_3[0x4a] = input[local_1e], param_3[0x4b] = input[local_1e+1]
+    # local_1e += 2. Same pattern — type byte position.
+    result.rssi1 = payload[pos]
+    if pos + 1 < n:
+        result.rssi2 = payload[pos + 1]
+    return pos + 2
+
+
+def _tlv_tid(payload, pos, n, result):
+    # TID: [03][type][len_hi][len_lo][data...]
+    if pos + 3 > n:
+        return n
+    result.tid_flag = payload[pos]
+    tid_len = (payload[pos + 1] << 8) | payload[pos + 2]
+    result.tid_len = tid_len
+    pos += 3
+    if pos + tid_len <= n:
+        result.tid = payload[pos:pos+tid_len]
+        pos += tid_len
+    return pos
+
+
+def _tlv_sub_ant(payload, pos, n, result):
+    # Sub-antenna: [06][sub_ant]
+    if pos + 1 < n:
+        result.sub_ant_num = payload[pos + 1]
+    return pos + 2
+
+
+# TLV type byte → handler(payload, pos, n, result) returning the next pos
+# (returning n ends the walk). Unlisted types are skipped one byte at a time.
+_TLV_HANDLERS = [None] * 256
+_TLV_HANDLERS[0xAA] = _tlv_header
+_TLV_HANDLERS[0x01] = _tlv_ant
+_TLV_HANDLERS[0x02] = _tlv_rssi
+_TLV_HANDLERS[0x03] = _tlv_tid
+_TLV_HANDLERS[0x06] = _tlv_sub_ant
+
+# bytes.translate table: known type byte → 0xFF, anything else → 0x00
+_TLV_KNOWN = bytes(0xFF if h else 0x00 for h in _TLV_HANDLERS)
+
+
+def parse_tag_notification(payload, out=None, hex_blobs=True):
     """Parse a tag notification packet payload (from CMD=0x12).
     
     This is the raw TLV data before it goes into tag_data_analise().
     Useful for real-time inventory parsing.
     
     Args:
-        payload: bytes from a CMD=0x12 packet
+        payload: bytes or memoryview from a CMD=0x12 packet. A memoryview
+                 is copied once up front: notifications are a few dozen
+                 bytes and the walker does byte-at-a-time indexing, which
+                 is faster on bytes than through the buffer protocol.
+        out:     optional TagNotification to reset and refill instead of
+                 allocating a new one
+        hex_blobs: epc/tid as uppercase hex (default) or, if False, raw bytes
     
     Returns:
-        dict with parsed tag data
+        TagNotification (``out`` if given); .as_dict() for the dict form
     """
-    result = {
-        'epc': '', 'epc_len': 0, 'pc': 0,
-        'ant_num': -1, 'sub_ant_num': -1,
-        'rssi1': 0, 'rssi2': 0,
-        'tid': '', 'tid_len': 0,
-    }
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    n = len(payload)
+    if out is None:
+        result = TagNotification()
+    else:
+        result = out
+        result.reset()
     
     pos = 0
-    while pos < len(payload):
-        tlv_type = payload[pos]
-        
-        if tlv_type == 0xAA:
-            # Header: [AA][?][PC_hi][len_hi][len_lo][epc_len_hi][epc_len_lo][EPC...]
-            if pos + 7 > len(payload):
-                break
-            result['pc'] = (payload[pos + 3] << 8) | payload[pos + 4]
-            epc_len = (payload[pos + 5] << 8) | payload[pos + 6]
-            result['epc_len'] = epc_len
-            pos += 7
-            if pos + epc_len <= len(payload):
-                result['epc'] = payload[pos:pos+epc_len].hex().upper()
-                pos += epc_len
-            # After EPC: [PC_hi][PC_lo][extra]
-            if pos + 3 <= len(payload):
-                result['pc'] = (payload[pos] << 8) | payload[pos + 1]
-                result['ant_num'] = payload[pos + 2]
-                pos += 3
-        
-        elif tlv_type == 0x01:
-            if pos + 2 < len(payload):
-                result['ant_num'] = payload[pos + 1]   # not pos, the type byte IS pos
-                # Wait — TLV type 1 uses: [01][ant][sub_ant]
-                # But from decompile: param_3[0x48] = input[pos], param_3[0x49] = input[pos+1]
-                # and local_1e += 2. So format is [01] already consumed, next 2 bytes are data
-                pass
-            # Actually from code: bVar1 is already read, then:
-            # param_3[0x48] = input[local_1e]       ← this is the byte AFTER type
-            # param_3[0x49] = input[local_1e + 1]
-            # local_1e += 2
-            # But the while loop reads bVar1 = input[local_1e] first, so type byte IS at local_1e
-            # Then for type 1: param_3[0x48] = input[local_1e] = type byte itself? No...
-            #
-            # Looking more carefully at the decompile:
-            # The switch reads bVar1 = *(byte*)(local_1e + param_1)
-            # Then case 1: param_3[0x48] = *(input + local_1e), param_3[0x49] = *(input + local_1e+1)
-            # local_1e += 2
-            # 
-            # This means the type byte IS consumed by the switch but NOT incremented yet!
-            # Actually no — bVar1 is read but local_1e is NOT advanced past the type byte.
-            # So param_3[0x48] = input[local_1e] = the type byte (0x01) itself??
-            #
-            # That seems wrong. Let me re-check... Actually in the decompile the reads use
-            # local_1e as-is (the position of the type byte), then advance by 2.
-            # So 0x48 = type byte (0x01), 0x49 = first data byte.
-            # But sql_insert maps 0x046 = ant_num and 0x047 = sub_ant_num (from TLV 0xAA/0x06).
-            # TLV type 1 goes to 0x048/0x049 which are NOT in SQL — they're informational only.
-            
-            result['ant_byte1'] = payload[pos]      # type byte itself
-            if pos + 1 < len(payload):
-                result['ant_byte2'] = payload[pos + 1]
-            pos += 2
-        
-        elif tlv_type == 0x02:
-            # RSSI: [02] already consumed by switch, next 2 bytes
-            # From code: param_3[0x4a] = input[local_1e], param_3[0x4b] = input[local_1e+1]
-            # local_1e += 2. Same pattern — type byte position.
-            result['rssi1'] = payload[pos]
-            if pos + 1 < len(payload):
-                result['rssi2'] = payload[pos + 1]
-            pos += 2
-        
-        elif tlv_type == 0x03:
-            # TID: [03][type][len_hi|len_lo][data...]
-            if pos + 3 <= len(payload):
-                result['tid_flag'] = payload[pos]
-                tid_len = payload[pos + 1] | payload[pos + 2]
-                result['tid_len'] = tid_len
-                pos += 3
-                if pos + tid_len <= len(payload):
-                    result['tid'] = payload[pos:pos+tid_len].hex().upper()
-                    pos += tid_len
-            else:
-                break
-        
-        elif tlv_type == 0x06:
-            # Sub-antenna: [06][sub_ant]
-            if pos + 1 < len(payload):
-                result['sub_ant_num'] = payload[pos + 1]
-            pos += 2
-        
+    marks = None
+    while pos < n:
+        handler = _TLV_HANDLERS[payload[pos]]
+        if handler is not None:
+            pos = handler(payload, pos, n, result)
         else:
-            # Unknown TLV type, try to skip
-            pos += 1
+            # Unknown TLV type — skip straight to the next known type byte
+            if marks is None:
+                marks = payload.translate(_TLV_KNOWN)
+            pos = marks.find(0xFF, pos + 1)
+            if pos < 0:
+                break
+    
+    # Handlers leave EPC/TID as raw slices of payload
+    epc, tid = result.epc, result.tid
+    if hex_blobs:
+        result.epc = epc.hex().upper() if epc else ''
+        result.tid = tid.hex().upper() if tid else ''
+    else:
+        result.epc = bytes(epc) if epc else b''
+        result.tid = bytes(tid) if tid else b''
     
     # Compute physical antenna
-    if result['ant_num'] >= 0 and result['sub_ant_num'] >= 0:
-        result['physical_antenna'] = result['ant_num'] * 2 + result['sub_ant_num'] + 1
+    if result.ant_num >= 0 and result.sub_ant_num >= 0:
+        result.physical_antenna = result.ant_num * 2 + result.sub_ant_num + 1
     
     return result
 
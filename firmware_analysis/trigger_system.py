@@ -158,6 +158,8 @@ When a trigger fires, the reader sends a notification to PC:
     Button press → start inventory → auto-stop after 30s
 """
 
+import struct
+
 # ═══════════════════════════════════════════════════════════
 # Trigger configuration builder
 # ═══════════════════════════════════════════════════════════
@@ -176,6 +178,18 @@ TRIGGER_MODES = {
 RF_CMD_START_INVENTORY = bytes([0x02, 0x10, 0x00, 0x00])  # CMD=0x02 SUB=0x10 LEN=0
 RF_CMD_STOP_INVENTORY  = bytes([0x02, 0xFF, 0x00, 0x00])  # CMD=0x02 SUB=0xFF LEN=0
 
+# Display names indexed by trigger mode value (see TRIGGER_MODES)
+MODE_NAMES = ('Disabled', 'Rising Edge', 'Falling Edge',
+              'Level HIGH', 'Level LOW', 'Any Edge', 'Delay Timer')
+
+
+def _mode_name(mode):
+    return MODE_NAMES[mode] if mode < len(MODE_NAMES) else f'Unknown({mode})'
+
+
+# Config blob header: +0 GPI pin, +1 start mode, +2 RF command length (BE)
+_HDR = struct.Struct('>BBH')
+
 def build_trigger_config(gpi_pin, start_mode, stop_mode, rf_command=None):
     """Build a trigger configuration blob.
     
@@ -193,15 +207,8 @@ def build_trigger_config(gpi_pin, start_mode, stop_mode, rf_command=None):
     
     cmd_len = len(rf_command)
     
-    config = bytearray()
-    config.append(gpi_pin)                    # +0: GPI pin
-    config.append(start_mode)                 # +1: start mode
-    config.append((cmd_len >> 8) & 0xFF)      # +2: cmd length high
-    config.append(cmd_len & 0xFF)             # +3: cmd length low
-    config.extend(rf_command)                 # +4: RF command data
-    config.append(stop_mode)                  # +4+N: stop mode
-    
-    return bytes(config)
+    # +0..3 header, +4 RF command data, +4+N stop mode
+    return _HDR.pack(gpi_pin, start_mode, cmd_len) + bytes(rf_command) + bytes((stop_mode,))
 
 
 def parse_trigger_config(data):
@@ -209,18 +216,13 @@ def parse_trigger_config(data):
     if len(data) < 5:
         return None
     
-    MODE_NAMES = {0: 'Disabled', 1: 'Rising Edge', 2: 'Falling Edge',
-                  3: 'Level HIGH', 4: 'Level LOW', 5: 'Any Edge', 6: 'Delay Timer'}
-    
-    gpi_pin = data[0]
-    start_mode = data[1]
-    cmd_len = (data[2] << 8) | data[3]
+    gpi_pin, start_mode, cmd_len = _HDR.unpack_from(data)
     
     if len(data) < 4 + cmd_len + 1:
         return {
             'gpi_pin': gpi_pin,
             'start_mode': start_mode,
-            'start_mode_name': MODE_NAMES.get(start_mode, f'Unknown({start_mode})'),
+            'start_mode_name': _mode_name(start_mode),
             'cmd_len': cmd_len,
             'error': 'truncated'
         }
@@ -231,11 +233,11 @@ def parse_trigger_config(data):
     return {
         'gpi_pin': gpi_pin,
         'start_mode': start_mode,
-        'start_mode_name': MODE_NAMES.get(start_mode, f'Unknown({start_mode})'),
+        'start_mode_name': _mode_name(start_mode),
         'cmd_len': cmd_len,
         'rf_command': rf_command.hex(),
         'stop_mode': stop_mode,
-        'stop_mode_name': MODE_NAMES.get(stop_mode, f'Unknown({stop_mode})'),
+        'stop_mode_name': _mode_name(stop_mode),
     }
 
 
@@ -487,8 +487,7 @@ async def get_all_antennas():
     r = require_reader()
     ports = {}
     with reader_lock:
-        for port in range(4):
-            result = r.get_antenna_config(port)
+        for port, result in enumerate(r.get_all_antennas()):
             ports[f"port_{port}"] = parse_result(result) if result else {}
     return {"ports": ports}
 